@@ -1,11 +1,12 @@
-import os
 import sys
+from pathlib import Path
 from typing import List
 
 import click
 
-from dagster._generate import download_example_from_github, generate_project, generate_repository
-from dagster._generate.download import AVAILABLE_EXAMPLES
+# Imports of dagster._generate are deferred to the command bodies: they pull in the
+# templating and download machinery, which only the one command that uses it should
+# pay the import cost for. Click does not need the symbols to register the commands.
 
 
 @click.group(name="project")
@@ -45,13 +46,9 @@ from_example_command_help_text = (
     help="Name of the new Dagster repository",
 )
 def scaffold_repository_command(name: str):
-    dir_abspath = os.path.abspath(name)
-    if os.path.isdir(dir_abspath) and os.path.exists(dir_abspath):
-        click.echo(
-            click.style(f"The directory {dir_abspath} already exists. ", fg="red")
-            + "\nPlease delete the contents of this path or choose another location."
-        )
-        sys.exit(1)
+    from dagster._generate import generate_repository
+
+    dir_abspath = _target_dir(name)
 
     generate_repository(dir_abspath)
     click.echo(_styled_success_statement(name, dir_abspath))
@@ -69,13 +66,9 @@ def scaffold_repository_command(name: str):
     help="Name of the new Dagster project",
 )
 def scaffold_command(name: str):
-    dir_abspath = os.path.abspath(name)
-    if os.path.isdir(dir_abspath) and os.path.exists(dir_abspath):
-        click.echo(
-            click.style(f"The directory {dir_abspath} already exists. ", fg="red")
-            + "\nPlease delete the contents of this path or choose another location."
-        )
-        sys.exit(1)
+    from dagster._generate import generate_project
+
+    dir_abspath = _target_dir(name)
 
     generate_project(dir_abspath)
     click.echo(_styled_success_statement(name, dir_abspath))
@@ -103,13 +96,9 @@ def scaffold_command(name: str):
     ),
 )
 def from_example_command(name: str, example: str):
-    dir_abspath = os.path.abspath(name)
-    if os.path.isdir(dir_abspath) and os.path.exists(dir_abspath):
-        click.echo(
-            click.style(f"The directory {dir_abspath} already exists. ", fg="red")
-            + "\nPlease delete the contents of this path or choose another location."
-        )
-        sys.exit(1)
+    from dagster._generate import download_example_from_github
+
+    dir_abspath = _target_dir(name)
 
     download_example_from_github(dir_abspath, example)
 
@@ -121,16 +110,33 @@ def from_example_command(name: str, example: str):
     help="List the examples that available to bootstrap with.",
 )
 def from_example_list_command():
+    from dagster._generate.download import AVAILABLE_EXAMPLES
+
     click.echo("Examples available in `dagster project from-example`:")
 
     click.echo(_styled_list_examples_prints(AVAILABLE_EXAMPLES))
 
 
+def _target_dir(name: str) -> Path:
+    """Resolve the target directory for a new project, exiting if it already exists.
+
+    Path.is_dir implies existence, so a single stat call covers both checks.
+    """
+    dir_path = Path(name).resolve()
+    if dir_path.is_dir():
+        click.echo(
+            click.style(f"The directory {dir_path} already exists. ", fg="red")
+            + "\nPlease delete the contents of this path or choose another location."
+        )
+        sys.exit(1)
+    return dir_path
+
+
 def _styled_list_examples_prints(examples: List[str]) -> str:
-    return "\n".join([f"* {name}" for name in examples])
+    return "\n".join(f"* {name}" for name in examples)
 
 
-def _styled_success_statement(name: str, path: str):
+def _styled_success_statement(name: str, path: Path):
     return (
         click.style("Success!", fg="green")
         + " Created "
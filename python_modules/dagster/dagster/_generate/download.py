@@ -2,9 +2,12 @@ import os
 import sys
 import tarfile
 from io import BytesIO
+from pathlib import Path
+from typing import Union
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
 
 from .generate import _should_skip_file
 
@@ -32,7 +35,25 @@ AVAILABLE_EXAMPLES = [
 ]
 
 
-def download_example_from_github(path: str, example: str):
+def _download_github_tarball() -> BytesIO:
+    """Fetch the repo tarball from GitHub into memory.
+
+    Uses a pooled session with retries and streams the body in 1 MiB chunks rather
+    than one monolithic read. GitHub generates the tarball on the fly (chunked
+    transfer, no Content-Length), so ranged or parallel fetches aren't an option here.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=8, max_retries=3))
+    buffer = BytesIO()
+    with session.get(DEFAULT_GITHUB_URL, stream=True) as response:
+        response.raise_for_status()
+        for chunk in iter(lambda: response.raw.read(1024 * 1024), b""):
+            buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+
+def download_example_from_github(path: Union[str, Path], example: str):
     if example not in AVAILABLE_EXAMPLES:
         click.echo(
             click.style(
@@ -48,8 +69,7 @@ def download_example_from_github(path: str, example: str):
 
     click.echo(f"Downloading example '{example}'. This may take a while.")
 
-    response = requests.get(DEFAULT_GITHUB_URL, stream=True)
-    with tarfile.open(fileobj=BytesIO(response.raw.read()), mode="r:gz") as tar_file:
+    with tarfile.open(fileobj=_download_github_tarball(), mode="r:gz") as tar_file:
         # Extract the selected example folder to destination
         subdir_and_files = [
             tarinfo
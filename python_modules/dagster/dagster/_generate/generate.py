@@ -1,5 +1,7 @@
 import os
 import posixpath
+from pathlib import Path
+from typing import Union
 
 import click
 import jinja2
@@ -9,7 +11,7 @@ from dagster.version import __version__ as dagster_version
 IGNORE_PATTERN_LIST = ["__pycache__", ".pytest_cache", "*.egg-info", ".DS_Store", "tox.ini"]
 
 
-def generate_repository(path: str):
+def generate_repository(path: Union[str, Path]):
     REPO_NAME_PLACEHOLDER = "REPO_NAME_PLACEHOLDER"
 
     click.echo(f"Creating a Dagster repository at {path}.")
@@ -26,7 +28,7 @@ def generate_repository(path: str):
     click.echo(f"Generated files for Dagster repository in {path}.")
 
 
-def generate_project(path: str):
+def generate_project(path: Union[str, Path]):
     PROJECT_NAME_PLACEHOLDER = "PROJECT_NAME_PLACEHOLDER"
 
     click.echo(f"Creating a Dagster project at {path}.")
@@ -48,7 +50,10 @@ def generate_project(path: str):
 
 
 def _generate_files_from_template(
-    path: str, name_placeholder: str, project_template_path: str, skip_mkdir: bool = False
+    path: Union[str, Path],
+    name_placeholder: str,
+    project_template_path: str,
+    skip_mkdir: bool = False,
 ):
     normalized_path = os.path.normpath(path)
     repo_name = os.path.basename(normalized_path).replace("-", "_")
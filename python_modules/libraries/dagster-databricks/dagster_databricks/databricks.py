@@ -3,6 +3,8 @@ import time
 
 import requests.exceptions
 from databricks_api import DatabricksAPI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import dagster
 import dagster._check as check
@@ -16,6 +18,45 @@ from .types import (
 # wait at most 24 hours by default for run execution
 DEFAULT_RUN_MAX_WAIT_TIME_SEC = 24 * 60 * 60
 
+# One adapter -- and therefore one urllib3 connection pool -- is shared by every client
+# in the process, so many concurrent step launches (e.g. a fanned-out DynamicOut)
+# multiplex over a bounded set of kept-alive connections instead of opening a separate
+# pool, and paying separate TLS handshakes, per step.
+_http_adapter = None
+
+
+class _DatabricksRetry(Retry):
+    """Retry policy for the shared adapter.
+
+    Status-based retries are restricted to idempotent methods. The POST endpoints this
+    integration uses (`jobs/runs/submit`, `dbfs/{create,add-block,close}`) are not
+    idempotent: retrying one after a gateway error whose original request actually
+    executed could submit a duplicate job run or corrupt an upload. The one status it
+    is safe to retry a POST on is 429, where the server rejected the request without
+    executing it.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == "POST":
+            return status_code == 429
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _get_shared_http_adapter():
+    global _http_adapter  # pylint: disable=global-statement
+    if _http_adapter is None:
+        _http_adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=_DatabricksRetry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            ),
+        )
+    return _http_adapter
+
 
 class DatabricksError(Exception):
     pass
@@ -28,23 +69,42 @@ class DatabricksClient:
         self.host = host
         self.workspace_id = workspace_id
         self.client = DatabricksAPI(host=host, token=token)
+        self._mount_pooled_adapter()
+
+    def _mount_pooled_adapter(self):
+        """Mount a pooled HTTP adapter on the underlying API client's session.
+
+        The step launcher polls the Databricks REST API every few seconds for the
+        lifetime of a job, so reusing connections avoids paying a TCP + TLS handshake
+        on every call. Retries for transient server errors are configured here so they
+        happen below the HTTP layer, with backoff.
+        """
+        session = getattr(self.client.client, "session", None)
+        if session is None:
+            # very old versions of the underlying API client manage their own connections
+            return
+        adapter = _get_shared_http_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
 
     def submit_run(self, *args, **kwargs):
         """Submit a run directly to the 'Runs Submit' API."""
         return self.client.jobs.submit_run(*args, **kwargs)["run_id"]  # pylint: disable=no-member
 
-    def read_file(self, dbfs_path, block_size=1024**2):
-        """Read a file from DBFS to a **byte string**."""
+    def read_file(self, dbfs_path, block_size=1024**2, offset=0):
+        """Read a file from DBFS to a **byte string**, starting at byte ``offset``."""
         if dbfs_path.startswith("dbfs://"):
             dbfs_path = dbfs_path[7:]
         data = b""
         bytes_read = 0
-        jdoc = self.client.dbfs.read(path=dbfs_path, length=block_size)  # pylint: disable=no-member
+        jdoc = self.client.dbfs.read(  # pylint: disable=no-member
+            path=dbfs_path, offset=offset, length=block_size
+        )
         data += base64.b64decode(jdoc["data"])
         while jdoc["bytes_read"] == block_size:
             bytes_read += jdoc["bytes_read"]
             jdoc = self.client.dbfs.read(  # pylint: disable=no-member
-                path=dbfs_path, offset=bytes_read, length=block_size
+                path=dbfs_path, offset=offset + bytes_read, length=block_size
             )
             data += base64.b64decode(jdoc["data"])
 
@@ -70,6 +130,36 @@ class DatabricksClient:
 
         self.client.dbfs.close(handle=handle)  # pylint: disable=no-member
 
+    def move_file(self, source_path, destination_path):
+        """Move (rename) a file on DBFS.
+
+        Raises an ``HTTPError`` with error code ``RESOURCE_ALREADY_EXISTS`` if a file
+        already exists at the destination path.
+        """
+        if source_path.startswith("dbfs://"):
+            source_path = source_path[7:]
+        if destination_path.startswith("dbfs://"):
+            destination_path = destination_path[7:]
+        self.client.dbfs.move(  # pylint: disable=no-member
+            source_path=source_path, destination_path=destination_path
+        )
+
+    def delete_file(self, dbfs_path):
+        """Delete a file on DBFS."""
+        if dbfs_path.startswith("dbfs://"):
+            dbfs_path = dbfs_path[7:]
+        self.client.dbfs.delete(path=dbfs_path)  # pylint: disable=no-member
+
+    def get_status(self, dbfs_path):
+        """Get the DBFS status of a file or directory, including its size in bytes.
+
+        Raises an ``HTTPError`` with error code ``RESOURCE_DOES_NOT_EXIST`` if no file
+        or directory exists at the given path.
+        """
+        if dbfs_path.startswith("dbfs://"):
+            dbfs_path = dbfs_path[7:]
+        return self.client.dbfs.get_status(path=dbfs_path)  # pylint: disable=no-member
+
     def get_run(self, databricks_run_id):
         return self.client.jobs.get_run(databricks_run_id)  # pylint: disable=no-member
 
@@ -1,10 +1,17 @@
 import gzip
+import hashlib
 import io
 import os.path
 import pickle
+import random
+import struct
 import tempfile
 import time
+import uuid
 import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 from dagster_databricks import databricks_step_main
 from dagster_databricks.databricks import (
@@ -39,6 +46,58 @@ from .configs import (
 CODE_ZIP_NAME = "code.zip"
 PICKLED_CONFIG_FILE_NAME = "config.pkl"
 
+# Highest pickle protocol understood by the Python 3.7 interpreter on older Databricks
+# runtimes (DBR 7.x and below). The launcher's Python may be newer than the cluster's,
+# so artifacts the cluster must read are pickled with this rather than HIGHEST_PROTOCOL.
+DBFS_ARTIFACT_PICKLE_PROTOCOL = 4
+
+# Directories under the staging prefix where the code zip and the step main script are
+# cached by content fingerprint, so that steps running the same code share one upload
+# rather than re-uploading per step.
+CODE_ZIP_CACHE_DIR = "code_zips"
+MAIN_SCRIPT_CACHE_DIR = "main_scripts"
+
+# Run-state polls are only needed to detect completion (and enforce the max wait time),
+# while the events file is what surfaces step progress, so we check the run state on
+# only every Nth event poll to halve the REST round trips made per poll cycle.
+EVENT_POLLS_PER_RUN_STATE_POLL = 4
+
+# Bounds for the adaptive poll interval: polling speeds up while the step is actively
+# producing events and backs off (with jitter, to avoid synchronized polling across
+# many concurrent steps) while it is idle, e.g. during cluster startup.
+MIN_POLL_INTERVAL_SEC = 0.5
+MAX_POLL_INTERVAL_SEC = 15.0
+
+# step_keys of dynamic steps contain brackets, which are invalid characters in DBFS
+# paths; a translation table replaces them in a single C-level pass
+_STEP_KEY_TRANSLATIONS = str.maketrans({"[": "__", "]": "__"})
+
+
+def _parse_event_frames(data):
+    """Decode as many complete length-prefixed event frames from ``data`` as possible.
+
+    The remote process appends each batch of events to the events file as a 4-byte
+    big-endian length followed by a gzipped pickle payload. Returns a tuple of the
+    decoded events and the number of bytes consumed; a trailing partial frame (the
+    remote process may be mid-write) is left unconsumed so that the next poll can
+    pick it up.
+    """
+    events = []
+    consumed = 0
+    # decode through a zero-copy view rather than slicing `data`, which would copy
+    # every payload a second time
+    view = memoryview(data)
+    while len(data) - consumed >= 4:
+        (frame_len,) = struct.unpack_from(">I", data, consumed)
+        frame_end = consumed + 4 + frame_len
+        if frame_end > len(data):
+            break
+        events.extend(
+            deserialize_value(pickle.loads(gzip.decompress(view[consumed + 4 : frame_end])))
+        )
+        consumed = frame_end
+    return events, consumed
+
 
 @resource(
     {
@@ -105,7 +164,9 @@ PICKLED_CONFIG_FILE_NAME = "config.pkl"
             float,
             is_required=False,
             default_value=5.0,
-            description="How frequently Dagster will poll Databricks to determine the state of the job.",
+            description="Initial interval in seconds between polls of Databricks for the state "
+            "of the job and new events. Polling speeds up while the step is actively producing "
+            "events and backs off while it is idle (e.g. during cluster startup).",
         ),
     }
 )
@@ -173,6 +234,24 @@ class DatabricksPySparkStepLauncher(StepLauncher):
             max_wait_time_sec=max_completion_wait_time_seconds,
         )
 
+        # The remote process appends events to the events file, so we track how many
+        # bytes of each events file we have already fetched and decoded, keyed by the
+        # DBFS path of the file.
+        self._step_events = defaultdict(list)
+        self._events_bytes_read = defaultdict(int)
+
+        # cached artifact paths this launcher has confirmed to exist on DBFS, so repeat
+        # steps skip even the existence check
+        self._uploaded_artifacts = set()
+
+        # content-addressed DBFS path of the step main script, computed on first use;
+        # the script is identical for every step launched by this process
+        self._main_script_cache = None
+
+        # DBFS path prefixes by (run_id, step_key); the events path is rebuilt on every
+        # poll, so the sanitization and joining work is done once per step instead
+        self._step_prefixes = {}
+
     def launch_step(self, step_context):
         step_run_ref = step_context_to_step_run_ref(
             step_context, self.local_dagster_job_package_path
@@ -181,9 +260,9 @@ class DatabricksPySparkStepLauncher(StepLauncher):
         log = step_context.log
 
         step_key = step_run_ref.step_key
-        self._upload_artifacts(log, step_run_ref, run_id, step_key)
+        python_file, code_zip_path = self._upload_artifacts(log, step_run_ref, run_id, step_key)
 
-        task = self._get_databricks_task(run_id, step_key)
+        task = self._get_databricks_task(run_id, step_key, python_file, code_zip_path)
         databricks_run_id = self.databricks_runner.submit_run(self.run_config, task)
 
         if self.permissions:
@@ -239,33 +318,45 @@ class DatabricksPySparkStepLauncher(StepLauncher):
         processed_events = 0
         start = time.time()
         done = False
+        poll_count = 0
+        interval = self.databricks_runner.poll_interval_sec
+        # honor a configured interval outside the adaptive bounds in either direction
+        min_interval = min(MIN_POLL_INTERVAL_SEC, self.databricks_runner.poll_interval_sec)
+        max_interval = max(MAX_POLL_INTERVAL_SEC, self.databricks_runner.poll_interval_sec)
         step_context.log.info("Waiting for Databricks run %s to complete..." % databricks_run_id)
         while not done:
             with raise_execution_interrupts():
-                step_context.log.debug(
-                    "Waiting %.1f seconds...", self.databricks_runner.poll_interval_sec
-                )
-                time.sleep(self.databricks_runner.poll_interval_sec)
+                step_context.log.debug("Waiting %.1f seconds...", interval)
+                time.sleep(interval * random.uniform(0.85, 1.15))
+                num_new_events = 0
                 try:
-                    done = poll_run_state(
-                        self.databricks_runner.client,
-                        step_context.log,
-                        start,
-                        databricks_run_id,
-                        self.databricks_runner.max_wait_time_sec,
-                    )
+                    if poll_count % EVENT_POLLS_PER_RUN_STATE_POLL == 0:
+                        done = poll_run_state(
+                            self.databricks_runner.client,
+                            step_context.log,
+                            start,
+                            databricks_run_id,
+                            self.databricks_runner.max_wait_time_sec,
+                        )
+                    poll_count += 1
                 finally:
                     all_events = self.get_step_events(
                         step_context.run_id, step_key, step_context.previous_attempt_count
                     )
                     # we get all available records on each poll, but we only want to process the
                     # ones we haven't seen before
-                    for event in all_events[processed_events:]:
+                    num_new_events = len(all_events) - processed_events
+                    for event in islice(all_events, processed_events, None):
                         # write each event from the DataBricks instance to the local instance
                         step_context.instance.handle_new_event(event)
                         if event.is_dagster_event:
                             yield event.dagster_event
                     processed_events = len(all_events)
+                if num_new_events:
+                    # sample sooner while the step is actively producing events
+                    interval = max(min_interval, interval * 0.7)
+                else:
+                    interval = min(max_interval, interval * 1.5)
 
         step_context.log.info(f"Databricks run {databricks_run_id} completed.")
 
@@ -273,10 +364,20 @@ class DatabricksPySparkStepLauncher(StepLauncher):
         path = self._dbfs_path(run_id, step_key, f"{retry_number}_{PICKLED_EVENTS_FILE_NAME}")
 
         def _get_step_records():
-            serialized_records = self.databricks_runner.client.read_file(path)
-            if not serialized_records:
-                return []
-            return deserialize_value(pickle.loads(gzip.decompress(serialized_records)))
+            bytes_read = self._events_bytes_read[path]
+            # a metadata-only stat is much cheaper than a download, so check whether the
+            # events file has grown since the last poll before fetching anything
+            status = self.databricks_runner.client.get_status(path)
+            if status["file_size"] <= bytes_read:
+                return self._step_events[path]
+            # only fetch bytes appended to the events file since the last poll, so the
+            # work done per poll is proportional to new events rather than all events
+            serialized_records = self.databricks_runner.client.read_file(path, offset=bytes_read)
+            if serialized_records:
+                records, bytes_consumed = _parse_event_frames(serialized_records)
+                self._step_events[path].extend(records)
+                self._events_bytes_read[path] += bytes_consumed
+            return self._step_events[path]
 
         try:
             # reading from dbfs while it writes can be flaky
@@ -286,13 +387,15 @@ class DatabricksPySparkStepLauncher(StepLauncher):
                 retry_on=(pickle.UnpicklingError, gzip.BadGzipFile, zlib.error, EOFError),
                 max_retries=4,
             )
-        # if you poll before the Databricks process has had a chance to create the file,
-        # we expect to get this error
         except HTTPError as e:
+            # if you poll before the Databricks process has had a chance to create the
+            # file, we expect to get this error
             if e.response.json().get("error_code") == "RESOURCE_DOES_NOT_EXIST":
-                return []
-
-        return []
+                return self._step_events[path]
+            # transient server errors (429/5xx) are already retried with backoff below
+            # the HTTP layer; anything that still surfaces here is not benign, so don't
+            # swallow it
+            raise
 
     def _grant_permissions(self, log, databricks_run_id, request_retries=3):
         api_client = self.databricks_runner.client.client.client
@@ -353,69 +456,176 @@ class DatabricksPySparkStepLauncher(StepLauncher):
                 )
         return permissions
 
-    def _get_databricks_task(self, run_id, step_key):
+    def _get_databricks_task(self, run_id, step_key, python_file, code_zip_path):
         """Construct the 'task' parameter to  be submitted to the Databricks API.
 
         This will create a 'spark_python_task' dict where `python_file` is a path on DBFS
         pointing to the 'databricks_step_main.py' file, and `parameters` is an array with a single
         element, a path on DBFS pointing to the picked `step_run_ref` data.
 
+        `python_file` and `code_zip_path` are the (possibly cached) DBFS paths of the
+        main script and code zip, as returned by `_upload_artifacts`.
+
         See https://docs.databricks.com/dev-tools/api/latest/jobs.html#jobssparkpythontask.
         """
-        python_file = self._dbfs_path(run_id, step_key, self._main_file_name())
         parameters = [
             self._internal_dbfs_path(run_id, step_key, PICKLED_STEP_RUN_REF_FILE_NAME),
             self._internal_dbfs_path(run_id, step_key, PICKLED_CONFIG_FILE_NAME),
-            self._internal_dbfs_path(run_id, step_key, CODE_ZIP_NAME),
+            code_zip_path,
         ]
         return {"spark_python_task": {"python_file": python_file, "parameters": parameters}}
 
     def _upload_artifacts(self, log, step_run_ref, run_id, step_key):
-        """Upload the step run ref and pyspark code to DBFS to run as a job."""
+        """Upload the step run ref and pyspark code to DBFS to run as a job.
 
-        log.info("Uploading main file to DBFS")
-        main_local_path = self._main_file_local_path()
-        with open(main_local_path, "rb") as infile:
-            self.databricks_runner.client.put_file(
-                infile, self._dbfs_path(run_id, step_key, self._main_file_name()), overwrite=True
-            )
+        Returns a tuple of the DBFS path of the main script (to be submitted as the
+        task's `python_file`) and the internal DBFS path of the code zip (to be passed
+        to the remote process). Both are content-addressed and may be shared with other
+        steps running the same code.
+        """
 
-        log.info("Uploading dagster job to DBFS")
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Zip and upload package containing dagster job
-            zip_local_path = os.path.join(temp_dir, CODE_ZIP_NAME)
-            build_pyspark_zip(zip_local_path, self.local_dagster_job_package_path)
-            with open(zip_local_path, "rb") as infile:
-                self.databricks_runner.client.put_file(
-                    infile, self._dbfs_path(run_id, step_key, CODE_ZIP_NAME), overwrite=True
-                )
+        code_fingerprint = self._code_fingerprint()
+        code_zip_cache_path = self._code_zip_cache_path(code_fingerprint)
+        main_script_cache_path = self._main_script_cache_path()
 
-        log.info("Uploading step run ref file to DBFS")
         step_pickle_file = io.BytesIO()
-
-        pickle.dump(step_run_ref, step_pickle_file)
+        pickle.dump(step_run_ref, step_pickle_file, protocol=DBFS_ARTIFACT_PICKLE_PROTOCOL)
         step_pickle_file.seek(0)
-        self.databricks_runner.client.put_file(
-            step_pickle_file,
-            self._dbfs_path(run_id, step_key, PICKLED_STEP_RUN_REF_FILE_NAME),
-            overwrite=True,
-        )
 
         databricks_config = DatabricksConfig(
             env_variables=self.env_variables,
             storage=self.storage,
             secrets=self.secrets,
         )
-        log.info("Uploading Databricks configuration to DBFS")
         databricks_config_file = io.BytesIO()
-
-        pickle.dump(databricks_config, databricks_config_file)
-        databricks_config_file.seek(0)
-        self.databricks_runner.client.put_file(
-            databricks_config_file,
-            self._dbfs_path(run_id, step_key, PICKLED_CONFIG_FILE_NAME),
-            overwrite=True,
+        pickle.dump(
+            databricks_config, databricks_config_file, protocol=DBFS_ARTIFACT_PICKLE_PROTOCOL
         )
+        databricks_config_file.seek(0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            uploads = [
+                (
+                    step_pickle_file,
+                    self._dbfs_path(run_id, step_key, PICKLED_STEP_RUN_REF_FILE_NAME),
+                ),
+                (
+                    databricks_config_file,
+                    self._dbfs_path(run_id, step_key, PICKLED_CONFIG_FILE_NAME),
+                ),
+            ]
+            cached_uploads = []
+            open_files = []
+            try:
+                if self._artifact_is_cached(code_zip_cache_path):
+                    log.info("Dagster job package unchanged; reusing code zip already on DBFS")
+                else:
+                    # Zip the package containing the dagster job on the main thread
+                    # (CPU-bound)
+                    zip_local_path = os.path.join(temp_dir, CODE_ZIP_NAME)
+                    build_pyspark_zip(zip_local_path, self.local_dagster_job_package_path)
+                    zip_file = open(zip_local_path, "rb")  # pylint: disable=consider-using-with
+                    open_files.append(zip_file)
+                    cached_uploads.append((zip_file, code_zip_cache_path))
+
+                if not self._artifact_is_cached(main_script_cache_path):
+                    main_file = open(  # pylint: disable=consider-using-with
+                        self._main_file_local_path(), "rb"
+                    )
+                    open_files.append(main_file)
+                    cached_uploads.append((main_file, main_script_cache_path))
+
+                log.info("Uploading step launch artifacts to DBFS")
+                # the uploads are independent and network-bound, so run them concurrently
+                # to overlap their transfer windows
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    put_futures = [
+                        executor.submit(
+                            self.databricks_runner.client.put_file,
+                            file_obj,
+                            dbfs_path,
+                            overwrite=True,
+                        )
+                        for file_obj, dbfs_path in uploads
+                    ]
+                    put_futures.extend(
+                        executor.submit(self._put_cached_artifact, file_obj, cache_path)
+                        for file_obj, cache_path in cached_uploads
+                    )
+                    for future in put_futures:
+                        future.result()
+                self._uploaded_artifacts.add(code_zip_cache_path)
+                self._uploaded_artifacts.add(main_script_cache_path)
+            finally:
+                for open_file in open_files:
+                    open_file.close()
+
+        return "dbfs://{}".format(main_script_cache_path), "/dbfs/{}".format(code_zip_cache_path)
+
+    def _code_fingerprint(self):
+        """Fingerprint of the local dagster job package, used to address the code zip cache.
+
+        Hashes the relative path, size, and mtime of every file in the package, which is
+        much cheaper than hashing file contents and changes whenever the package does.
+        """
+        hasher = hashlib.sha256()
+        package_path = self.local_dagster_job_package_path
+        for root, dirs, files in os.walk(package_path):
+            dirs.sort()
+            for filename in sorted(files):
+                file_path = os.path.join(root, filename)
+                stat = os.stat(file_path)
+                relpath = os.path.relpath(file_path, package_path)
+                hasher.update("{}:{}:{}".format(relpath, stat.st_size, stat.st_mtime_ns).encode())
+        return hasher.hexdigest()[:16]
+
+    def _code_zip_cache_path(self, code_fingerprint):
+        return "/".join([self.staging_prefix, CODE_ZIP_CACHE_DIR, f"{code_fingerprint}.zip"])
+
+    def _main_script_cache_path(self):
+        if self._main_script_cache is None:
+            with open(self._main_file_local_path(), "rb") as main_file:
+                fingerprint = hashlib.sha256(main_file.read()).hexdigest()[:16]
+            self._main_script_cache = "/".join(
+                [self.staging_prefix, MAIN_SCRIPT_CACHE_DIR, f"{fingerprint}.py"]
+            )
+        return self._main_script_cache
+
+    def _put_cached_artifact(self, file_obj, cache_path):
+        """Upload an artifact to its content-addressed cache path.
+
+        The upload streams to a unique temporary path and is then moved into place, so
+        the cache path only ever exists fully written: an interrupted upload can't
+        leave a partial file there that later steps would trust.
+        """
+        client = self.databricks_runner.client
+        temp_path = "{}.{}.tmp".format(cache_path, uuid.uuid4().hex)
+        client.put_file(file_obj, temp_path)
+        try:
+            client.move_file(temp_path, cache_path)
+        except HTTPError as e:
+            if e.response.json().get("error_code") != "RESOURCE_ALREADY_EXISTS":
+                raise
+            # another launcher finished uploading the same artifact first; since the
+            # path is content-addressed, theirs is identical to ours
+            client.delete_file(temp_path)
+
+    def _artifact_is_cached(self, cache_path):
+        """Whether the artifact already exists at its content-addressed path on DBFS.
+
+        Cached artifacts are moved into place only once fully uploaded (see
+        `_put_cached_artifact`), so existence implies the artifact is complete.
+        """
+        if cache_path in self._uploaded_artifacts:
+            return True
+        try:
+            self.databricks_runner.client.get_status(cache_path)
+        except HTTPError as e:
+            if e.response.json().get("error_code") == "RESOURCE_DOES_NOT_EXIST":
+                return False
+            raise
+        self._uploaded_artifacts.add(cache_path)
+        return True
 
     def _log_logs_from_cluster(self, log, run_id):
         logs = self.databricks_runner.retrieve_logs_for_run_id(log, run_id)
@@ -427,38 +637,28 @@ class DatabricksPySparkStepLauncher(StepLauncher):
         if stdout:
             log.info(stdout)
 
-    def _main_file_name(self):
-        return os.path.basename(self._main_file_local_path())
-
     def _main_file_local_path(self):
         return databricks_step_main.__file__
 
     def _sanitize_step_key(self, step_key: str) -> str:
-        # step_keys of dynamic steps contain brackets, which are invalid characters
-        return step_key.replace("[", "__").replace("]", "__")
+        return step_key.translate(_STEP_KEY_TRANSLATIONS)
+
+    def _step_prefix(self, run_id, step_key):
+        key = (run_id, step_key)
+        prefix = self._step_prefixes.get(key)
+        if prefix is None:
+            prefix = "/".join([self.staging_prefix, run_id, self._sanitize_step_key(step_key)])
+            self._step_prefixes[key] = prefix
+        return prefix
 
     def _dbfs_path(self, run_id, step_key, filename):
-        path = "/".join(
-            [
-                self.staging_prefix,
-                run_id,
-                self._sanitize_step_key(step_key),
-                os.path.basename(filename),
-            ]
+        return "dbfs://{}/{}".format(
+            self._step_prefix(run_id, step_key), os.path.basename(filename)
         )
-        return "dbfs://{}".format(path)
 
     def _internal_dbfs_path(self, run_id, step_key, filename):
         """Scripts running on Databricks should access DBFS at /dbfs/."""
-        path = "/".join(
-            [
-                self.staging_prefix,
-                run_id,
-                self._sanitize_step_key(step_key),
-                os.path.basename(filename),
-            ]
-        )
-        return "/dbfs/{}".format(path)
+        return "/dbfs/{}/{}".format(self._step_prefix(run_id, step_key), os.path.basename(filename))
 
 
 class DatabricksConfig:
@@ -12,6 +12,7 @@ import gzip
 import os
 import pickle
 import site
+import struct
 import sys
 import tempfile
 import time
@@ -40,12 +41,12 @@ DONE = object()
 def event_writing_loop(events_queue: Queue, put_events_fn):
     """
     Periodically check whether the instance has posted any new events to the queue.  If they have,
-    write ALL events (not just the new events) to DBFS.
+    encode just those new events into a new frame and flush the events file; frames written by
+    earlier batches are never re-encoded.
     """
-    all_events = []
+    pending_events = []
 
     done = False
-    got_new_events = False
     time_posted_last_batch = time.time()
     while not done:
         try:
@@ -53,15 +54,14 @@ def event_writing_loop(events_queue: Queue, put_events_fn):
             if event_or_done == DONE:
                 done = True
             else:
-                all_events.append(event_or_done)
-                got_new_events = True
+                pending_events.append(event_or_done)
         except Empty:
             pass
 
         enough_time_between_batches = time.time() - time_posted_last_batch > 1
-        if got_new_events and (done or enough_time_between_batches):
-            put_events_fn(all_events)
-            got_new_events = False
+        if pending_events and (done or enough_time_between_batches):
+            put_events_fn(pending_events)
+            pending_events = []
             time_posted_last_batch = time.time()
 
 
@@ -117,9 +117,24 @@ def main(
             ):
                 pass
 
+            # all frames written to the events file so far; the DBFS fuse mount doesn't
+            # support appending to an existing file, so each flush rewrites the file
+            # from this buffer instead
+            frames = bytearray()
+
             def put_events(events):
-                with gzip.open(events_filepath, "wb") as handle:
-                    pickle.dump(serialize_value(events), handle)
+                # Each batch of events becomes a length-prefixed gzipped pickle frame,
+                # so the step launcher can fetch and decode only the bytes it hasn't
+                # seen instead of re-reading the full file on every poll. Every flush
+                # rewrites earlier frames byte-for-byte before the new one, which keeps
+                # the launcher's offset reads valid.
+                payload = gzip.compress(
+                    pickle.dumps(serialize_value(events), protocol=pickle.HIGHEST_PROTOCOL)
+                )
+                frames.extend(struct.pack(">I", len(payload)))
+                frames.extend(payload)
+                with open(events_filepath, "wb") as handle:
+                    handle.write(frames)
 
             # Set up a thread to handle writing events back to the plan process, so execution doesn't get
             # blocked on remote communication
@@ -1,4 +1,7 @@
+import gzip
 import os
+import pickle
+import struct
 from typing import Dict
 from unittest import mock
 
@@ -11,9 +14,14 @@ from dagster_databricks import (
     databricks_pyspark_step_launcher,
 )
 from dagster_databricks.databricks import DatabricksRunState
+from dagster_databricks.databricks_pyspark_step_launcher import (
+    EVENT_POLLS_PER_RUN_STATE_POLL,
+    DatabricksPySparkStepLauncher,
+)
 from dagster_pyspark import DataFrame, pyspark_resource
 from pyspark.sql import Row
 from pyspark.sql.types import IntegerType, StringType, StructField, StructType
+from requests import HTTPError
 
 from dagster import fs_io_manager, reconstructable
 from dagster._core.definitions.no_step_launcher import no_step_launcher
@@ -26,6 +34,7 @@ from dagster._legacy import (
     pipeline,
     solid,
 )
+from dagster._serdes import serialize_value
 from dagster._utils.merger import deep_merge_dicts
 
 S3_BUCKET = "dagster-databricks-tests"
@@ -172,6 +181,8 @@ def test_local():
 @mock.patch("dagster_databricks.databricks.DatabricksClient.submit_run")
 @mock.patch("dagster_databricks.databricks.DatabricksClient.read_file")
 @mock.patch("dagster_databricks.databricks.DatabricksClient.put_file")
+@mock.patch("dagster_databricks.databricks.DatabricksClient.move_file")
+@mock.patch("dagster_databricks.databricks.DatabricksClient.get_status")
 @mock.patch("dagster_databricks.DatabricksPySparkStepLauncher.get_step_events")
 @mock.patch("dagster_databricks.databricks.DatabricksClient.get_run")
 @mock.patch("dagster_databricks.databricks.DatabricksClient.get_run_state")
@@ -181,18 +192,25 @@ def test_pyspark_databricks(
     mock_get_run_state,
     mock_get_run,
     mock_get_step_events,
+    mock_get_status,
+    mock_move_file,
     mock_put_file,
     mock_read_file,
     mock_submit_run,
 ):
     mock_submit_run.return_value = 12345
     mock_read_file.return_value = "somefilecontents".encode()
+    # report the code zip as not yet cached on DBFS so every launch uploads it
+    status_error = HTTPError(response=mock.MagicMock())
+    status_error.response.json.return_value = {"error_code": "RESOURCE_DOES_NOT_EXIST"}
+    mock_get_status.side_effect = status_error
 
     running_state = DatabricksRunState(DatabricksRunLifeCycleState.Running, None, "")
     final_state = DatabricksRunState(
         DatabricksRunLifeCycleState.Terminated, DatabricksRunResultState.Success, ""
     )
-    mock_get_run_state.side_effect = [running_state] * 5 + [final_state]
+    # the run state is only checked on every EVENT_POLLS_PER_RUN_STATE_POLL-th poll
+    mock_get_run_state.side_effect = [running_state] * 2 + [final_state]
 
     with instance_for_test() as instance:
         result = execute_pipeline(
@@ -234,9 +252,11 @@ def test_pyspark_databricks(
     assert result.success
     assert mock_perform_query.call_count == 2
     assert mock_get_run.call_count == 1
-    assert mock_get_run_state.call_count == 6
-    assert mock_get_step_events.call_count == 6
+    assert mock_get_run_state.call_count == 3
+    assert mock_get_step_events.call_count == 2 * EVENT_POLLS_PER_RUN_STATE_POLL + 1
     assert mock_put_file.call_count == 4
+    # the code zip and main script are uploaded to temp paths, then moved into the cache
+    assert mock_move_file.call_count == 2
     assert mock_read_file.call_count == 2
     assert mock_submit_run.call_count == 1
 
@@ -273,6 +293,49 @@ def test_pyspark_databricks(
         )
 
 
+def _frame(events):
+    # mirrors the framing used by `put_events` in databricks_step_main.py
+    payload = gzip.compress(pickle.dumps(serialize_value(events)))
+    return struct.pack(">I", len(payload)) + payload
+
+
+@mock.patch("dagster_databricks.databricks.DatabricksClient.get_status")
+@mock.patch("dagster_databricks.databricks.DatabricksClient.read_file")
+def test_get_step_events_incremental(mock_read_file, mock_get_status):
+    launcher = DatabricksPySparkStepLauncher(
+        run_config={},
+        permissions={},
+        databricks_host="",
+        databricks_token="",
+        secrets_to_env_variables=[],
+        staging_prefix="/dagster-databricks-tests",
+        wait_for_logs=False,
+        max_completion_wait_time_seconds=100,
+        local_dagster_job_package_path=os.path.abspath(os.path.dirname(__file__)),
+    )
+
+    frame_one = _frame(["event1", "event2"])
+    frame_two = _frame(["event3"])
+    full_size = len(frame_one) + len(frame_two)
+    mock_get_status.side_effect = [
+        {"file_size": len(frame_one) + 3},
+        {"file_size": full_size},
+        {"file_size": full_size},
+    ]
+    # the second frame is initially only partially written; the launcher should leave
+    # it unconsumed and pick it up on the following poll
+    mock_read_file.side_effect = [frame_one + frame_two[:3], frame_two]
+
+    assert launcher.get_step_events("run_id", "step_key", 0) == ["event1", "event2"]
+    assert launcher.get_step_events("run_id", "step_key", 0) == ["event1", "event2", "event3"]
+    # the file hasn't grown, so the third poll stats it but skips the download
+    assert launcher.get_step_events("run_id", "step_key", 0) == ["event1", "event2", "event3"]
+
+    assert mock_get_status.call_count == 3
+    offsets = [call.kwargs["offset"] for call in mock_read_file.call_args_list]
+    assert offsets == [0, len(frame_one)]
+
+
 @pytest.mark.skipif(
     "DATABRICKS_TEST_DO_IT_LIVE_S3" not in os.environ,
     reason="This test is slow and requires a Databricks cluster; run only upon explicit request",